@@ -1,125 +1,436 @@
 import openai
+import asyncio
 import logging
 import os
+import re
 from typing import List, Optional
 import json
 
 logger = logging.getLogger(__name__)
 
+# Fields requested from the model for every analyzed guideline
+ANALYSIS_FIELDS = """
+            - summary: a concise clinical summary in 3-5 bullet points (one string, bullets separated by newlines)
+              focusing on key clinical recommendations, target patient population, important clinical
+              outcomes and any significant changes from previous guidelines
+            - tags: a list of 5-8 medical tags covering specialties (e.g. Cardiology, Endocrinology),
+              conditions (e.g. Diabetes, Sepsis), procedures (e.g. Screening, Prevention) and
+              patient populations (e.g. Pediatrics, Geriatrics)
+            - complexity_level: "Basic", "Intermediate", or "Advanced"
+            - target_audience: "Primary Care", "Specialists", "Nurses", "Pharmacists", etc.
+            - clinical_urgency: "Routine", "Important", or "Critical"
+            - evidence_strength: "Strong", "Moderate", or "Limited"
+"""
+
+# Bump whenever the analysis prompt changes so cached summaries are regenerated
+PROMPT_VERSION = "v1"
+
+# Stored in place of PROMPT_VERSION for fallback analyses so they are retried
+# rather than served as cached AI results
+FALLBACK_PROMPT_VERSION = "fallback"
+
+# Number of guidelines packed into a single batched AI request
+BATCH_SIZE = 15
+
+def _keyword_pattern(keywords) -> re.Pattern:
+    """
+    Compile keywords into a single alternation, longest first so that
+    overlapping keywords (e.g. 'heart' / 'heart disease') match in full
+    """
+    return re.compile('|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)))
+
+# Fallback keyword tables, matched against the lowercased title in a single
+# regex scan each; when a title contains several keywords of one table the
+# leftmost one wins
+SUMMARY_SPECIALTIES = {
+    'cardiology': 'Cardiovascular health guidelines',
+    'diabetes': 'Diabetes management recommendations',
+    'hypertension': 'Blood pressure management protocols',
+    'infectious': 'Infectious disease treatment guidelines',
+    'pediatric': 'Pediatric care recommendations',
+    'geriatric': 'Geriatric care protocols',
+    'obstetric': 'Obstetric and gynecological care',
+    'emergency': 'Emergency medicine protocols',
+    'oncology': 'Cancer treatment guidelines',
+    'respiratory': 'Respiratory care recommendations'
+}
+
+SPECIALTY_KEYWORDS = {
+    'cardiology': ['heart', 'cardiac', 'cardiovascular', 'hypertension', 'blood pressure'],
+    'endocrinology': ['diabetes', 'endocrine', 'glucose', 'insulin', 'metabolic'],
+    'infectious disease': ['infection', 'bacterial', 'viral', 'antibiotic', 'sepsis'],
+    'pediatrics': ['pediatric', 'child', 'infant', 'neonatal', 'adolescent'],
+    'geriatrics': ['geriatric', 'elderly', 'aging', 'senior'],
+    'obstetrics': ['pregnancy', 'obstetric', 'maternal', 'fetal', 'gynecology'],
+    'emergency medicine': ['emergency', 'urgent', 'acute', 'trauma'],
+    'oncology': ['cancer', 'oncology', 'tumor', 'malignant', 'chemotherapy'],
+    'respiratory': ['respiratory', 'lung', 'asthma', 'copd', 'pneumonia'],
+    'neurology': ['neurological', 'brain', 'stroke', 'seizure', 'migraine']
+}
+
+CONDITIONS = [
+    'diabetes', 'hypertension', 'asthma', 'depression', 'anxiety',
+    'arthritis', 'osteoporosis', 'dementia', 'stroke', 'heart disease',
+    'cancer', 'obesity', 'smoking', 'alcohol', 'substance abuse'
+]
+
+PROCEDURES = [
+    'screening', 'diagnosis', 'treatment', 'prevention', 'vaccination',
+    'surgery', 'medication', 'therapy', 'monitoring', 'assessment'
+]
+
+_SUMMARY_SPECIALTY_RE = _keyword_pattern(SUMMARY_SPECIALTIES)
+_SUMMARY_POINTS = [
+    (_keyword_pattern(['treatment', 'therapy']), "• Provides evidence-based treatment recommendations"),
+    (_keyword_pattern(['diagnosis', 'screening']), "• Outlines diagnostic and screening protocols"),
+    (_keyword_pattern(['prevention', 'preventive']), "• Focuses on preventive care strategies"),
+    (_keyword_pattern(['management']), "• Comprehensive management approach for healthcare providers")
+]
+
+_SPECIALTY_BY_KEYWORD = {
+    keyword: specialty
+    for specialty, keywords in SPECIALTY_KEYWORDS.items()
+    for keyword in keywords
+}
+_SPECIALTY_RE = _keyword_pattern(_SPECIALTY_BY_KEYWORD)
+_CONDITION_RE = _keyword_pattern(CONDITIONS)
+_PROCEDURE_RE = _keyword_pattern(PROCEDURES)
+
+_BASIC_RE = _keyword_pattern(['basic', 'primary', 'general'])
+_ADVANCED_RE = _keyword_pattern(['advanced', 'specialist', 'complex'])
+_PEDIATRIC_RE = _keyword_pattern(['pediatric', 'child', 'infant'])
+_GERIATRIC_RE = _keyword_pattern(['geriatric', 'elderly'])
+_EMERGENCY_RE = _keyword_pattern(['emergency', 'urgent'])
+_CRITICAL_RE = _keyword_pattern(['emergency', 'urgent', 'critical', 'severe'])
+_IMPORTANT_RE = _keyword_pattern(['important', 'significant'])
+
 class AISummarizer:
     def __init__(self):
         # Initialize OpenAI client
-        api_key = os.getenv('OPENAI_API_KEY')
-        if api_key:
-            openai.api_key = api_key
-            self.client = openai.OpenAI(api_key=api_key)
+        self.api_key = os.getenv('OPENAI_API_KEY')
+        if self.api_key:
+            openai.api_key = self.api_key
             self.enabled = True
         else:
             logger.warning("OpenAI API key not found. AI summarization will be disabled.")
             self.enabled = False
+        
+        # Async client for the current event loop, created lazily by _async_client
+        self.client = None
+        self._client_loop = None
+    
+    def _async_client(self):
+        """Return the OpenAI client, creating it for the running event loop if needed"""
+        loop = asyncio.get_running_loop()
+        # Pooled connections can't be reused across event loops (each asyncio.run() gets a new one)
+        if self.client is None or self._client_loop is not loop:
+            self.client = openai.AsyncOpenAI(api_key=self.api_key)
+            self._client_loop = loop
+        return self.client
+    
+    async def aclose(self):
+        """Close the OpenAI client's pooled connections"""
+        if self.client is not None:
+            await self._async_client().close()
             self.client = None
+            self._client_loop = None
     
-    def summarize_guideline(self, title: str, content: str = "") -> str:
+    async def analyze_all(self, title: str, content: str = "") -> dict:
         """
-        Generate a concise summary of a medical guideline using AI
+        Generate summary, tags and complexity analysis in a single AI request
         
         Args:
             title: The title of the guideline
             content: The content/description of the guideline
             
         Returns:
-            A 3-5 bullet point summary of the guideline
+            Dict with summary, tags, complexity_level, target_audience,
+            clinical_urgency and evidence_strength
         """
         if not self.enabled:
-            return self._generate_fallback_summary(title, content)
+            return self._generate_fallback_analysis(title, content)
         
         try:
-            prompt = f"""
-            You are a medical professional tasked with summarizing clinical practice guidelines.
+            response = await self._async_client().chat.completions.create(**self._analysis_request(title, content))
             
-            Please provide a concise, clinical summary of the following medical guideline in 3-5 bullet points:
+            analysis = json.loads(response.choices[0].message.content)
+            logger.info(f"Generated AI analysis for: {title[:50]}...")
+            return self._normalize_analysis(analysis, title, content)
             
-            Title: {title}
-            Content: {content[:1000] if content else title}
+        except Exception as e:
+            logger.error(f"Error generating AI analysis: {e}")
+            return self._generate_fallback_analysis(title, content)
+    
+    def _analysis_request(self, title: str, content: str = "") -> dict:
+        """
+        Build the chat completion parameters for analyzing a single guideline
+        """
+        prompt = f"""
+        Analyze the following medical guideline:
+        
+        Title: {title}
+        Content: {content[:1000] if content else title}
+        
+        Return a JSON object with exactly these fields:
+        {ANALYSIS_FIELDS}
+        """
+        
+        return {
+            "model": "gpt-3.5-turbo-1106",
+            "messages": [
+                {"role": "system", "content": "You are a medical professional expert in clinical practice guidelines. Always respond with a single JSON object."},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": {"type": "json_object"},
+            "max_tokens": 500,
+            "temperature": 0.2
+        }
+    
+    async def summarize_batch(self, items: List[dict]) -> List[dict]:
+        """
+        Analyze several guidelines in a single AI request
+        
+        Args:
+            items: List of dicts with 'title' and optional 'content'
+            
+        Returns:
+            List of analysis dicts (see analyze_all), in the same order as items
+        """
+        if not items:
+            return []
+        
+        if not self.enabled:
+            return [self._generate_fallback_analysis(item['title'], item.get('content', '')) for item in items]
+        
+        guidelines_text = "\n".join(
+            f"{index}. TITLE: {item['title']} CONTENT: {(item.get('content') or item['title'])[:500]}"
+            for index, item in enumerate(items, start=1)
+        )
+        
+        try:
+            prompt = f"""
+            Analyze each of the following {len(items)} medical guidelines:
             
-            Format your response as bullet points focusing on:
-            - Key clinical recommendations
-            - Target patient population
-            - Important clinical outcomes
-            - Any significant changes from previous guidelines
+            {guidelines_text}
             
-            Keep each bullet point concise and clinically relevant.
+            Return a JSON object {{"results": [...]}} where results is an array of length {len(items)}.
+            Each element must contain the guideline's "index" (as numbered above) and these fields:
+            {ANALYSIS_FIELDS}
             """
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+            response = await self._async_client().chat.completions.create(
+                model="gpt-3.5-turbo-1106",
                 messages=[
-                    {"role": "system", "content": "You are a medical professional expert in clinical practice guidelines."},
+                    {"role": "system", "content": "You are a medical professional expert in clinical practice guidelines. Always respond with a single JSON object."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=300,
-                temperature=0.3
+                response_format={"type": "json_object"},
+                max_tokens=min(350 * len(items), 4096),
+                temperature=0.2
             )
             
-            summary = response.choices[0].message.content.strip()
-            logger.info(f"Generated AI summary for: {title[:50]}...")
-            return summary
+            results = json.loads(response.choices[0].message.content).get('results', [])
+            
+        except json.JSONDecodeError:
+            # Output was most likely truncated; retry with smaller batches
+            if len(items) == 1:
+                return [await self.analyze_all(items[0]['title'], items[0].get('content', ''))]
+            
+            middle = len(items) // 2
+            logger.warning(f"Truncated AI batch response, retrying with {middle} guidelines per batch")
+            return await self.summarize_batch(items[:middle]) + await self.summarize_batch(items[middle:])
             
         except Exception as e:
-            logger.error(f"Error generating AI summary: {e}")
-            return self._generate_fallback_summary(title, content)
+            logger.error(f"Error generating AI batch analysis: {e}")
+            return [self._generate_fallback_analysis(item['title'], item.get('content', '')) for item in items]
+        
+        by_index = {}
+        for result in results if isinstance(results, list) else []:
+            if not isinstance(result, dict):
+                continue
+            try:
+                by_index[int(result.get('index'))] = result
+            except (TypeError, ValueError):
+                continue
+        
+        missing = [index for index in range(1, len(items) + 1) if index not in by_index]
+        if missing:
+            logger.warning(f"AI batch response is missing {len(missing)} of {len(items)} guidelines")
+            
+            # Ask again for the ones that were left out, as long as the batch made progress
+            if len(missing) < len(items):
+                retried = await self.summarize_batch([items[index - 1] for index in missing])
+            else:
+                retried = [self._generate_fallback_analysis(items[index - 1]['title'], items[index - 1].get('content', ''))
+                           for index in missing]
+            retried_by_index = dict(zip(missing, retried))
+        else:
+            retried_by_index = {}
+        
+        logger.info(f"Generated AI analysis for batch of {len(items)} guidelines")
+        return [
+            retried_by_index[index] if index in retried_by_index
+            else self._normalize_analysis(by_index[index], item['title'], item.get('content', ''))
+            for index, item in enumerate(items, start=1)
+        ]
     
-    def extract_tags(self, title: str, content: str = "") -> List[str]:
+    async def submit_batch(self, items: List[dict]) -> Optional[str]:
         """
-        Extract relevant medical tags/keywords from a guideline
+        Submit guidelines to the OpenAI Batch API for asynchronous analysis
         
         Args:
-            title: The title of the guideline
-            content: The content/description of the guideline
+            items: List of dicts with 'content_hash', 'title' and optional 'content'
             
         Returns:
-            List of relevant medical tags
+            The batch ID, or None if the batch could not be submitted
         """
-        if not self.enabled:
-            return self._extract_fallback_tags(title, content)
+        if not self.enabled or not items:
+            return None
         
         try:
-            prompt = f"""
-            You are a medical professional tasked with extracting relevant tags from clinical guidelines.
-            
-            Please extract 5-8 relevant medical tags/keywords from the following guideline:
+            lines = [
+                json.dumps({
+                    "custom_id": item['content_hash'],
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._analysis_request(item['title'], item.get('content', ''))
+                })
+                for item in items
+            ]
             
-            Title: {title}
-            Content: {content[:500] if content else title}
+            batch_file = await self._async_client().files.create(
+                file=("guidelines.jsonl", "\n".join(lines).encode()),
+                purpose="batch"
+            )
+            batch = await self._async_client().batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
             
-            Focus on:
-            - Medical specialties (e.g., Cardiology, Endocrinology, Infectious Disease)
-            - Conditions (e.g., Diabetes, Hypertension, Sepsis)
-            - Procedures (e.g., Screening, Treatment, Prevention)
-            - Patient populations (e.g., Pediatrics, Geriatrics, Pregnant Women)
+            logger.info(f"Submitted AI batch {batch.id} with {len(items)} guidelines")
+            return batch.id
             
-            Return only the tags as a comma-separated list, no explanations.
-            """
+        except Exception as e:
+            logger.error(f"Error submitting AI batch: {e}")
+            return None
+    
+    async def fetch_batch_results(self, batch_id: str, items: List[dict]) -> Optional[dict]:
+        """
+        Collect the results of a batch submitted with submit_batch
+        
+        Args:
+            batch_id: The batch ID returned by submit_batch
+            items: The guidelines that were submitted in the batch
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a medical professional expert in clinical practice guidelines."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=150,
-                temperature=0.2
-            )
+        Returns:
+            Dict mapping content_hash to analysis dict (see analyze_all), or None
+            if the batch is still in progress. Failed or expired batches return
+            an empty dict.
+        """
+        batch = await self._async_client().batches.retrieve(batch_id)
+        
+        if batch.status in ('failed', 'expired', 'cancelled'):
+            logger.error(f"AI batch {batch_id} ended with status {batch.status}")
+            return {}
+        
+        if batch.status != 'completed':
+            return None
+        
+        items_by_hash = {item['content_hash']: item for item in items}
+        results = {}
+        
+        if batch.output_file_id:
+            output = await self._async_client().files.content(batch.output_file_id)
             
-            tags_text = response.choices[0].message.content.strip()
-            tags = [tag.strip() for tag in tags_text.split(',') if tag.strip()]
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                
+                try:
+                    record = json.loads(line)
+                    item = items_by_hash.get(record['custom_id'])
+                    if item is None or record.get('error'):
+                        continue
+                    
+                    message = record['response']['body']['choices'][0]['message']['content']
+                    analysis = json.loads(message)
+                    results[item['content_hash']] = self._normalize_analysis(
+                        analysis, item['title'], item.get('content', '')
+                    )
+                except (KeyError, IndexError, TypeError, json.JSONDecodeError) as e:
+                    logger.error(f"Error parsing AI batch result: {e}")
+                    continue
+        
+        logger.info(f"AI batch {batch_id} completed with {len(results)}/{len(items)} results")
+        return results
+    
+    async def summarize_guideline(self, title: str, content: str = "") -> str:
+        """
+        Generate a concise summary of a medical guideline using AI
+        
+        Args:
+            title: The title of the guideline
+            content: The content/description of the guideline
             
-            logger.info(f"Extracted tags for {title[:50]}...: {tags}")
-            return tags
+        Returns:
+            A 3-5 bullet point summary of the guideline
+        """
+        analysis = await self.analyze_all(title, content)
+        return analysis['summary']
+    
+    async def extract_tags(self, title: str, content: str = "") -> List[str]:
+        """
+        Extract relevant medical tags/keywords from a guideline
+        
+        Args:
+            title: The title of the guideline
+            content: The content/description of the guideline
             
-        except Exception as e:
-            logger.error(f"Error extracting AI tags: {e}")
-            return self._extract_fallback_tags(title, content)
+        Returns:
+            List of relevant medical tags
+        """
+        analysis = await self.analyze_all(title, content)
+        return analysis['tags']
+    
+    def _normalize_analysis(self, analysis: dict, title: str, content: str = "") -> dict:
+        """
+        Fill in missing or malformed fields of an AI analysis with fallback values
+        """
+        fallback = self._generate_fallback_analysis(title, content)
+        
+        summary = analysis.get('summary')
+        if isinstance(summary, list):
+            summary = "\n".join(str(point) for point in summary)
+        
+        tags = analysis.get('tags')
+        if isinstance(tags, str):
+            tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+        
+        has_summary = isinstance(summary, str) and bool(summary.strip())
+        normalized = {
+            'summary': summary.strip() if has_summary else fallback['summary'],
+            'tags': [str(tag) for tag in tags] if isinstance(tags, list) and tags else fallback['tags'],
+            # Without an AI summary the result is no better than the fallback,
+            # so it must not be cached as a final analysis
+            'is_fallback': not has_summary
+        }
+        for field in ('complexity_level', 'target_audience', 'clinical_urgency', 'evidence_strength'):
+            normalized[field] = analysis.get(field) or fallback[field]
+        
+        return normalized
+    
+    def _generate_fallback_analysis(self, title: str, content: str = "") -> dict:
+        """
+        Generate a fallback analysis when AI is not available
+        """
+        analysis = {
+            'summary': self._generate_fallback_summary(title, content),
+            'tags': self._extract_fallback_tags(title, content),
+            'is_fallback': True
+        }
+        analysis.update(self._analyze_fallback_complexity(title, content))
+        return analysis
     
     def _generate_fallback_summary(self, title: str, content: str = "") -> str:
         """
@@ -131,36 +442,14 @@ class AISummarizer:
         summary_points = []
         
         # Identify medical specialties
-        specialties = {
-            'cardiology': 'Cardiovascular health guidelines',
-            'diabetes': 'Diabetes management recommendations',
-            'hypertension': 'Blood pressure management protocols',
-            'infectious': 'Infectious disease treatment guidelines',
-            'pediatric': 'Pediatric care recommendations',
-            'geriatric': 'Geriatric care protocols',
-            'obstetric': 'Obstetric and gynecological care',
-            'emergency': 'Emergency medicine protocols',
-            'oncology': 'Cancer treatment guidelines',
-            'respiratory': 'Respiratory care recommendations'
-        }
-        
-        for specialty, description in specialties.items():
-            if specialty in title_lower:
-                summary_points.append(f"• {description}")
-                break
+        match = _SUMMARY_SPECIALTY_RE.search(title_lower)
+        if match:
+            summary_points.append(f"• {SUMMARY_SPECIALTIES[match.group(0)]}")
         
         # Add general points based on common terms
-        if 'treatment' in title_lower or 'therapy' in title_lower:
-            summary_points.append("• Provides evidence-based treatment recommendations")
-        
-        if 'diagnosis' in title_lower or 'screening' in title_lower:
-            summary_points.append("• Outlines diagnostic and screening protocols")
-        
-        if 'prevention' in title_lower or 'preventive' in title_lower:
-            summary_points.append("• Focuses on preventive care strategies")
-        
-        if 'management' in title_lower:
-            summary_points.append("• Comprehensive management approach for healthcare providers")
+        for pattern, point in _SUMMARY_POINTS:
+            if pattern.search(title_lower):
+                summary_points.append(point)
         
         # Add a general point if we don't have enough
         if len(summary_points) < 2:
@@ -177,47 +466,19 @@ class AISummarizer:
         tags = []
         
         # Medical specialties
-        specialty_keywords = {
-            'cardiology': ['heart', 'cardiac', 'cardiovascular', 'hypertension', 'blood pressure'],
-            'endocrinology': ['diabetes', 'endocrine', 'glucose', 'insulin', 'metabolic'],
-            'infectious disease': ['infection', 'bacterial', 'viral', 'antibiotic', 'sepsis'],
-            'pediatrics': ['pediatric', 'child', 'infant', 'neonatal', 'adolescent'],
-            'geriatrics': ['geriatric', 'elderly', 'aging', 'senior'],
-            'obstetrics': ['pregnancy', 'obstetric', 'maternal', 'fetal', 'gynecology'],
-            'emergency medicine': ['emergency', 'urgent', 'acute', 'trauma'],
-            'oncology': ['cancer', 'oncology', 'tumor', 'malignant', 'chemotherapy'],
-            'respiratory': ['respiratory', 'lung', 'asthma', 'copd', 'pneumonia'],
-            'neurology': ['neurological', 'brain', 'stroke', 'seizure', 'migraine']
-        }
-        
-        # Check for specialties
-        for specialty, keywords in specialty_keywords.items():
-            if any(keyword in title_lower for keyword in keywords):
-                tags.append(specialty.title())
-                break
+        match = _SPECIALTY_RE.search(title_lower)
+        if match:
+            tags.append(_SPECIALTY_BY_KEYWORD[match.group(0)].title())
         
         # Common medical conditions
-        conditions = [
-            'diabetes', 'hypertension', 'asthma', 'depression', 'anxiety',
-            'arthritis', 'osteoporosis', 'dementia', 'stroke', 'heart disease',
-            'cancer', 'obesity', 'smoking', 'alcohol', 'substance abuse'
-        ]
-        
-        for condition in conditions:
-            if condition in title_lower:
-                tags.append(condition.title())
-                break
+        match = _CONDITION_RE.search(title_lower)
+        if match:
+            tags.append(match.group(0).title())
         
         # Procedures and interventions
-        procedures = [
-            'screening', 'diagnosis', 'treatment', 'prevention', 'vaccination',
-            'surgery', 'medication', 'therapy', 'monitoring', 'assessment'
-        ]
-        
-        for procedure in procedures:
-            if procedure in title_lower:
-                tags.append(procedure.title())
-                break
+        match = _PROCEDURE_RE.search(title_lower)
+        if match:
+            tags.append(match.group(0).title())
         
         # If no tags found, add general ones
         if not tags:
@@ -225,49 +486,15 @@ class AISummarizer:
         
         return tags[:5]  # Limit to 5 tags
     
-    def analyze_guideline_complexity(self, title: str, content: str = "") -> dict:
+    async def analyze_guideline_complexity(self, title: str, content: str = "") -> dict:
         """
         Analyze the complexity and target audience of a guideline
         """
-        if not self.enabled:
-            return self._analyze_fallback_complexity(title, content)
-        
-        try:
-            prompt = f"""
-            Analyze the following medical guideline for complexity and target audience:
-            
-            Title: {title}
-            Content: {content[:500] if content else title}
-            
-            Provide a JSON response with:
-            - complexity_level: "Basic", "Intermediate", or "Advanced"
-            - target_audience: "Primary Care", "Specialists", "Nurses", "Pharmacists", etc.
-            - clinical_urgency: "Routine", "Important", or "Critical"
-            - evidence_strength: "Strong", "Moderate", or "Limited"
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a medical professional expert in clinical practice guidelines."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.2
-            )
-            
-            analysis_text = response.choices[0].message.content.strip()
-            
-            # Try to parse JSON response
-            try:
-                analysis = json.loads(analysis_text)
-                return analysis
-            except json.JSONDecodeError:
-                return self._analyze_fallback_complexity(title, content)
-                
-        except Exception as e:
-            logger.error(f"Error analyzing guideline complexity: {e}")
-            return self._analyze_fallback_complexity(title, content)
+        analysis = await self.analyze_all(title, content)
+        return {
+            field: analysis[field]
+            for field in ('complexity_level', 'target_audience', 'clinical_urgency', 'evidence_strength')
+        }
     
     def _analyze_fallback_complexity(self, title: str, content: str = "") -> dict:
         """
@@ -276,27 +503,27 @@ class AISummarizer:
         title_lower = title.lower()
         
         # Simple heuristics for complexity
-        if any(word in title_lower for word in ['basic', 'primary', 'general']):
+        if _BASIC_RE.search(title_lower):
             complexity = "Basic"
-        elif any(word in title_lower for word in ['advanced', 'specialist', 'complex']):
+        elif _ADVANCED_RE.search(title_lower):
             complexity = "Advanced"
         else:
             complexity = "Intermediate"
         
         # Target audience
-        if any(word in title_lower for word in ['pediatric', 'child', 'infant']):
+        if _PEDIATRIC_RE.search(title_lower):
             audience = "Pediatricians"
-        elif any(word in title_lower for word in ['geriatric', 'elderly']):
+        elif _GERIATRIC_RE.search(title_lower):
             audience = "Geriatricians"
-        elif any(word in title_lower for word in ['emergency', 'urgent']):
+        elif _EMERGENCY_RE.search(title_lower):
             audience = "Emergency Medicine"
         else:
             audience = "Primary Care"
         
         # Clinical urgency
-        if any(word in title_lower for word in ['emergency', 'urgent', 'critical', 'severe']):
+        if _CRITICAL_RE.search(title_lower):
             urgency = "Critical"
-        elif any(word in title_lower for word in ['important', 'significant']):
+        elif _IMPORTANT_RE.search(title_lower):
             urgency = "Important"
         else:
             urgency = "Routine"
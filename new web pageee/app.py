@@ -1,22 +1,40 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
+from flask.json.provider import JSONProvider
 import sqlite3
-import json
-import hashlib
+import asyncio
+import orjson
+import itertools
 import datetime
 import threading
-import schedule
-import time
 import logging
+import xxhash
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
+from apscheduler.schedulers.background import BackgroundScheduler
 from dotenv import load_dotenv
 import os
 from scraper import MedicalGuidelineScraper
-from ai_summarizer import AISummarizer
+from ai_summarizer import AISummarizer, BATCH_SIZE, FALLBACK_PROMPT_VERSION, PROMPT_VERSION
 
 # Load environment variables
 load_dotenv()
 
+class ORJSONProvider(JSONProvider):
+    """Serialize jsonify responses with orjson instead of the stdlib json module"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)
 
 # Configure logging
@@ -27,188 +45,556 @@ logger = logging.getLogger(__name__)
 scraper = MedicalGuidelineScraper()
 ai_summarizer = AISummarizer()
 
+def compute_content_hash(title, source, link):
+    """Hash identifying a guideline for deduplication (not used for security)"""
+    return xxhash.xxh3_128_hexdigest(f"{title}{source}{link}".encode())
+
 class DatabaseManager:
+    # Frequently run statements are kept as fixed strings so each connection's
+    # statement cache reuses the prepared statement instead of re-parsing it
+    _insert_sql = '''
+        INSERT OR REPLACE INTO guidelines
+        (title, source, link, date, summary, tags, content_hash, prompt_version, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    '''
+    _get_by_hash_sql = '''
+        SELECT summary, tags FROM guidelines
+        WHERE content_hash = ? AND prompt_version = ?
+    '''
+    
     def __init__(self, db_path="medical_guidelines.db"):
         self.db_path = db_path
+        self._local = threading.local()
         self.init_database()
     
+    def _conn(self):
+        """Return this thread's long-lived connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA cache_size=-20000')
+            conn.execute('PRAGMA foreign_keys=ON')
+            # Let rows deleted by INSERT OR REPLACE fire the DELETE triggers
+            conn.execute('PRAGMA recursive_triggers=ON')
+            self._local.conn = conn
+        return conn
+    
     def init_database(self):
         """Initialize the database with the guidelines table"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
         
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS guidelines (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                source TEXT NOT NULL,
-                link TEXT NOT NULL,
-                date TEXT NOT NULL,
-                summary TEXT,
-                tags TEXT,
-                content_hash TEXT UNIQUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        # Every gunicorn worker runs this at startup; holding the write lock
+        # for the whole schema setup makes each check-then-migrate step see
+        # the work of any worker that got there first
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS guidelines (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    link TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    summary TEXT,
+                    tags TEXT,
+                    content_hash TEXT UNIQUE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    prompt_version TEXT DEFAULT 'v1'
+                )
+            ''')
+        
+            # Add prompt_version to databases created before it existed
+            cursor.execute('PRAGMA table_info(guidelines)')
+            columns = [row[1] for row in cursor.fetchall()]
+            if 'prompt_version' not in columns:
+                cursor.execute("ALTER TABLE guidelines ADD COLUMN prompt_version TEXT DEFAULT 'v1'")
+        
+            # content_hash is already UNIQUE on its own, so this index was redundant
+            cursor.execute('DROP INDEX IF EXISTS idx_guidelines_hash_version')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_guidelines_created_at
+                ON guidelines(created_at)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_guidelines_source
+                ON guidelines(source, date)
+            ''')
+        
+            # Normalized tags so specialty filtering can be done in SQL
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'guideline_tags'")
+            migrate_tags = cursor.fetchone() is None
+        
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS guideline_tags (
+                    guideline_id INTEGER NOT NULL REFERENCES guidelines(id) ON DELETE CASCADE,
+                    tag TEXT NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_guideline_tags_guideline
+                ON guideline_tags(guideline_id)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_guideline_tags_tag
+                ON guideline_tags(tag COLLATE NOCASE)
+            ''')
+        
+            # Keep guideline_tags in sync with the JSON tags column; rows removed
+            # by INSERT OR REPLACE are cleaned up by the ON DELETE CASCADE
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS guidelines_tags_insert
+                AFTER INSERT ON guidelines
+                WHEN json_valid(NEW.tags)
+                BEGIN
+                    INSERT INTO guideline_tags (guideline_id, tag)
+                    SELECT NEW.id, value FROM json_each(NEW.tags) WHERE type = 'text';
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS guidelines_tags_update
+                AFTER UPDATE OF tags ON guidelines
+                BEGIN
+                    DELETE FROM guideline_tags WHERE guideline_id = NEW.id;
+                    INSERT INTO guideline_tags (guideline_id, tag)
+                    SELECT NEW.id, value FROM json_each(NEW.tags)
+                    WHERE json_valid(NEW.tags) AND type = 'text';
+                END
+            ''')
+        
+            if migrate_tags:
+                cursor.execute('''
+                    INSERT INTO guideline_tags (guideline_id, tag)
+                    SELECT guidelines.id, tag.value
+                    FROM guidelines, json_each(guidelines.tags) AS tag
+                    WHERE json_valid(guidelines.tags) AND tag.type = 'text'
+                ''')
+        
+            # Aggregates for /api/specialties and /api/stats, maintained by triggers
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'specialties'")
+            migrate_counts = cursor.fetchone() is None
+        
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS specialties (
+                    name TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS source_counts (
+                    source TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL
+                )
+            ''')
+        
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS guideline_tags_count_insert
+                AFTER INSERT ON guideline_tags
+                BEGIN
+                    INSERT INTO specialties (name, count) VALUES (NEW.tag, 1)
+                    ON CONFLICT(name) DO UPDATE SET count = count + 1;
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS guideline_tags_count_delete
+                AFTER DELETE ON guideline_tags
+                BEGIN
+                    UPDATE specialties SET count = count - 1 WHERE name = OLD.tag;
+                    DELETE FROM specialties WHERE name = OLD.tag AND count <= 0;
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS guidelines_source_count_insert
+                AFTER INSERT ON guidelines
+                BEGIN
+                    INSERT INTO source_counts (source, count) VALUES (NEW.source, 1)
+                    ON CONFLICT(source) DO UPDATE SET count = count + 1;
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS guidelines_source_count_delete
+                AFTER DELETE ON guidelines
+                BEGIN
+                    UPDATE source_counts SET count = count - 1 WHERE source = OLD.source;
+                    DELETE FROM source_counts WHERE source = OLD.source AND count <= 0;
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS guidelines_source_count_update
+                AFTER UPDATE OF source ON guidelines
+                BEGIN
+                    UPDATE source_counts SET count = count - 1 WHERE source = OLD.source;
+                    DELETE FROM source_counts WHERE source = OLD.source AND count <= 0;
+                    INSERT INTO source_counts (source, count) VALUES (NEW.source, 1)
+                    ON CONFLICT(source) DO UPDATE SET count = count + 1;
+                END
+            ''')
+        
+            if migrate_counts:
+                cursor.execute('''
+                    INSERT INTO specialties (name, count)
+                    SELECT tag, COUNT(*) FROM guideline_tags GROUP BY tag
+                ''')
+                cursor.execute('''
+                    INSERT INTO source_counts (source, count)
+                    SELECT source, COUNT(*) FROM guidelines GROUP BY source
+                ''')
+        
+            # Content hashes used to be MD5; rehash existing rows once so they keep
+            # matching freshly scraped guidelines
+            cursor.execute('PRAGMA user_version')
+            if cursor.fetchone()[0] < 1:
+                self._conn().create_function('content_hash', 3, compute_content_hash, deterministic=True)
+                cursor.execute('UPDATE guidelines SET content_hash = content_hash(title, source, link)')
+                cursor.execute('PRAGMA user_version = 1')
+        
+            # Guidelines awaiting results from the OpenAI Batch API
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS pending_batches (
+                    batch_id TEXT PRIMARY KEY,
+                    guidelines TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('COMMIT')
+        except Exception:
+            self._rollback()
+            raise
         
-        conn.commit()
-        conn.close()
         logger.info("Database initialized successfully")
     
-    def insert_guideline(self, title, source, link, date, summary, tags, content_hash):
+    def insert_guideline(self, title, source, link, date, summary, tags, content_hash, prompt_version=PROMPT_VERSION):
         """Insert or update a guideline based on content hash"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
         
         try:
-            cursor.execute('''
-                INSERT OR REPLACE INTO guidelines 
-                (title, source, link, date, summary, tags, content_hash, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (title, source, link, date, summary, tags, content_hash))
+            cursor.execute('BEGIN')
+            cursor.execute(self._insert_sql, (title, source, link, date, summary, tags, content_hash, prompt_version))
+            cursor.execute('COMMIT')
             
-            conn.commit()
             logger.info(f"Guideline inserted/updated: {title}")
             return True
         except Exception as e:
+            self._rollback()
             logger.error(f"Error inserting guideline: {e}")
             return False
-        finally:
-            conn.close()
     
-    def get_all_guidelines(self):
-        """Retrieve all guidelines from the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def insert_guidelines_bulk(self, rows):
+        """Insert or update many guidelines in a single transaction
         
-        cursor.execute('''
-            SELECT id, title, source, link, date, summary, tags, created_at, updated_at
-            FROM guidelines
-            ORDER BY date DESC
-        ''')
+        Each row is a (title, source, link, date, summary, tags, content_hash, prompt_version) tuple.
+        Rows replace the stored row with the same content_hash, so a real AI analysis
+        overwrites an earlier fallback one.
+        """
+        cursor = self._conn().cursor()
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.executemany(self._insert_sql, rows)
+            cursor.execute('COMMIT')
+            
+            logger.info(f"{len(rows)} guidelines inserted/updated")
+            return True
+        except Exception as e:
+            self._rollback()
+            logger.error(f"Error inserting guidelines: {e}")
+            return False
+    
+    def _rollback(self):
+        """Roll back the current thread's open transaction, if any"""
+        conn = self._conn()
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+    
+    def add_pending_batch(self, batch_id, guidelines):
+        """Record a submitted AI batch and the guidelines it covers"""
+        cursor = self._conn().cursor()
+        
+        cursor.execute(
+            'INSERT INTO pending_batches (batch_id, guidelines) VALUES (?, ?)',
+            (batch_id, orjson.dumps(guidelines).decode())
+        )
+    
+    def get_pending_batches(self):
+        """Return a list of (batch_id, guidelines) for AI batches not yet collected"""
+        cursor = self._conn().cursor()
         
+        cursor.execute('SELECT batch_id, guidelines FROM pending_batches ORDER BY created_at')
         rows = cursor.fetchall()
-        conn.close()
         
-        guidelines = []
-        for row in rows:
-            guidelines.append({
-                'id': row[0],
-                'title': row[1],
-                'source': row[2],
-                'link': row[3],
-                'date': row[4],
-                'summary': row[5],
-                'tags': json.loads(row[6]) if row[6] else [],
-                'created_at': row[7],
-                'updated_at': row[8]
-            })
+        return [(batch_id, orjson.loads(guidelines)) for batch_id, guidelines in rows]
+    
+    def delete_pending_batch(self, batch_id):
+        """Forget an AI batch once its results have been collected"""
+        cursor = self._conn().cursor()
         
-        return guidelines
+        cursor.execute('DELETE FROM pending_batches WHERE batch_id = ?', (batch_id,))
     
-    def get_guidelines_by_filter(self, source=None, specialty=None, year=None):
-        """Filter guidelines by various criteria"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def get_by_hash(self, content_hash, prompt_version=PROMPT_VERSION):
+        """Return the stored (summary, tags) for a content hash, or None if not cached"""
+        cursor = self._conn().cursor()
+        
+        cursor.execute(self._get_by_hash_sql, (content_hash, prompt_version))
+        
+        return cursor.fetchone()
+    
+    def iter_guidelines(self, source=None, specialty=None, year=None):
+        """Yield guidelines matching the optional filters one at a time, newest first"""
+        cursor = self._conn().cursor()
         
         query = '''
-            SELECT id, title, source, link, date, summary, tags, created_at, updated_at
-            FROM guidelines
+            SELECT g.id, g.title, g.source, g.link, g.date, g.summary, g.tags, g.created_at, g.updated_at
+            FROM guidelines AS g
             WHERE 1=1
         '''
         params = []
         
         if source:
-            query += " AND source = ?"
+            query += " AND g.source = ?"
             params.append(source)
         
         if year:
-            query += " AND strftime('%Y', date) = ?"
+            query += " AND strftime('%Y', g.date) = ?"
             params.append(str(year))
         
-        query += " ORDER BY date DESC"
+        if specialty:
+            query += """ AND EXISTS (
+                SELECT 1 FROM guideline_tags
+                WHERE guideline_id = g.id AND tag = ? COLLATE NOCASE
+            )"""
+            params.append(specialty)
+        
+        query += " ORDER BY g.date DESC"
         
         cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
         
-        guidelines = []
-        for row in rows:
-            guideline = {
+        for row in cursor:
+            yield {
                 'id': row[0],
                 'title': row[1],
                 'source': row[2],
                 'link': row[3],
                 'date': row[4],
                 'summary': row[5],
-                'tags': json.loads(row[6]) if row[6] else [],
+                'tags': orjson.loads(row[6]) if row[6] else [],
                 'created_at': row[7],
                 'updated_at': row[8]
             }
-            
-            # Filter by specialty if specified
-            if specialty and guideline['tags']:
-                if specialty.lower() not in [tag.lower() for tag in guideline['tags']]:
-                    continue
-            
-            guidelines.append(guideline)
+    
+    def get_sources(self):
+        """Return the names of all sources with stored guidelines"""
+        cursor = self._conn().cursor()
+        
+        cursor.execute('SELECT source FROM source_counts ORDER BY source')
+        return [row[0] for row in cursor.fetchall()]
+    
+    def get_specialties(self):
+        """Return all tags used by stored guidelines"""
+        cursor = self._conn().cursor()
+        
+        cursor.execute('SELECT name FROM specialties ORDER BY name')
+        return [row[0] for row in cursor.fetchall()]
+    
+    def get_stats(self):
+        """Return guideline totals overall, by source and for the last 30 days"""
+        cursor = self._conn().cursor()
+        
+        # Guidelines by source
+        cursor.execute('SELECT source, count FROM source_counts')
+        source_counts = dict(cursor.fetchall())
+        
+        # Recent guidelines (last 30 days)
+        cursor.execute('''
+            SELECT COUNT(*) FROM guidelines 
+            WHERE created_at >= date('now', '-30 days')
+        ''')
+        recent_guidelines = cursor.fetchone()[0]
         
-        return guidelines
+        return {
+            'total_guidelines': sum(source_counts.values()),
+            'source_counts': source_counts,
+            'recent_guidelines': recent_guidelines
+        }
+    
+    def get_all_guidelines(self):
+        """Retrieve all guidelines from the database"""
+        return list(self.iter_guidelines())
+    
+    def get_guidelines_by_filter(self, source=None, specialty=None, year=None):
+        """Filter guidelines by various criteria"""
+        return list(self.iter_guidelines(source, specialty, year))
 
 # Initialize database manager
 db_manager = DatabaseManager()
 
-def scrape_and_update():
-    """Main scraping function that runs in background"""
+# Upper bound on in-flight OpenAI requests to stay within rate limits
+MAX_CONCURRENT_AI_REQUESTS = 50
+
+# Sources, specialties and stats only change after a scrape, so serve them
+# from a short-lived cache that is cleared whenever guidelines are stored
+AGGREGATE_CACHE_TTL = 300
+_aggregate_cache = TTLCache(maxsize=8, ttl=AGGREGATE_CACHE_TTL)
+_aggregate_cache_lock = threading.Lock()
+
+def _clear_aggregate_cache():
+    with _aggregate_cache_lock:
+        _aggregate_cache.clear()
+
+async def _bounded(semaphore, coro):
+    """Await a coroutine while holding the semaphore"""
+    async with semaphore:
+        return await coro
+
+def _chunked(items, size):
+    """Yield successive lists of at most size items"""
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+def _guideline_row(guideline, analysis):
+    """Build an insert_guidelines_bulk row from a scraped guideline and its AI analysis"""
+    return (
+        guideline['title'],
+        guideline['source'],
+        guideline['link'],
+        guideline['date'],
+        analysis['summary'],
+        orjson.dumps(analysis['tags']).decode(),
+        guideline['content_hash'],
+        FALLBACK_PROMPT_VERSION if analysis.get('is_fallback') else PROMPT_VERSION
+    )
+
+async def scrape_and_update(use_batch_api=False):
+    """Main scraping function that runs in background
+    
+    With use_batch_api, new guidelines are submitted to the OpenAI Batch API
+    and stored later by check_pending_batches instead of being summarized inline.
+    """
     logger.info("Starting scheduled scraping...")
     
     try:
         # Scrape all sources
-        all_guidelines = scraper.scrape_all_sources()
+        all_guidelines = await scraper.scrape_all_sources_async()
         
+        # Guidelines already submitted in a batch will be stored once it completes
+        pending_hashes = {
+            guideline['content_hash']
+            for _, guidelines in db_manager.get_pending_batches()
+            for guideline in guidelines
+        }
+        
+        # Only guidelines without a summary for the current prompt version need AI analysis
+        new_guidelines = {}
         for guideline in all_guidelines:
             # Generate content hash for deduplication
-            content_hash = hashlib.md5(
-                f"{guideline['title']}{guideline['source']}{guideline['link']}".encode()
-            ).hexdigest()
+            guideline['content_hash'] = compute_content_hash(
+                guideline['title'], guideline['source'], guideline['link']
+            )
             
-            # Generate AI summary and tags
-            summary = ai_summarizer.summarize_guideline(guideline['title'], guideline.get('content', ''))
-            tags = ai_summarizer.extract_tags(guideline['title'], guideline.get('content', ''))
+            if guideline['content_hash'] in pending_hashes:
+                continue
             
-            # Store in database
-            db_manager.insert_guideline(
-                title=guideline['title'],
-                source=guideline['source'],
-                link=guideline['link'],
-                date=guideline['date'],
-                summary=summary,
-                tags=json.dumps(tags),
-                content_hash=content_hash
-            )
+            if db_manager.get_by_hash(guideline['content_hash']) is None:
+                new_guidelines[guideline['content_hash']] = guideline
+        
+        new_guidelines = list(new_guidelines.values())
+        logger.info(f"{len(all_guidelines) - len(new_guidelines)} guidelines already summarized or pending, "
+                    f"{len(new_guidelines)} need AI analysis")
+        
+        # Analyze the guideline pages rather than just their titles; the
+        # fallback analysis only reads the title, so skip the downloads without AI
+        if ai_summarizer.enabled:
+            contents = await scraper.get_many_contents(guideline['link'] for guideline in new_guidelines)
+            for guideline in new_guidelines:
+                guideline['content'] = contents[guideline['link']] or guideline['content']
+        
+        if use_batch_api and ai_summarizer.enabled and new_guidelines:
+            batch_id = await ai_summarizer.submit_batch(new_guidelines)
+            if batch_id:
+                db_manager.add_pending_batch(batch_id, new_guidelines)
+                logger.info(f"Scraping completed. Submitted {len(new_guidelines)} guidelines for batch analysis")
+                return
+            
+            logger.warning("Batch submission failed, analyzing guidelines synchronously")
+        
+        # Generate AI summary, tags and complexity concurrently, one request per batch of guidelines
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_AI_REQUESTS)
+        batch_results = await asyncio.gather(*(
+            _bounded(semaphore, ai_summarizer.summarize_batch(batch))
+            for batch in _chunked(new_guidelines, BATCH_SIZE)
+        ))
+        analyses = [analysis for batch in batch_results for analysis in batch]
+        
+        # Store in database in a single transaction
+        rows = [_guideline_row(guideline, analysis) for guideline, analysis in zip(new_guidelines, analyses)]
+        if rows:
+            db_manager.insert_guidelines_bulk(rows)
+            _clear_aggregate_cache()
         
         logger.info(f"Scraping completed. Processed {len(all_guidelines)} guidelines")
         
     except Exception as e:
         logger.error(f"Error during scraping: {e}")
+    finally:
+        # The scraper's and AI clients are tied to this run's event loop
+        await scraper.aclose()
+        await ai_summarizer.aclose()
+
+async def check_pending_batches():
+    """Store the results of any AI batches that have finished"""
+    try:
+        for batch_id, guidelines in db_manager.get_pending_batches():
+            try:
+                results = await ai_summarizer.fetch_batch_results(batch_id, guidelines)
+                if results is None:
+                    continue
+                
+                rows = [
+                    _guideline_row(guideline, results[guideline['content_hash']])
+                    for guideline in guidelines
+                    if guideline['content_hash'] in results
+                ]
+                if rows:
+                    db_manager.insert_guidelines_bulk(rows)
+                    _clear_aggregate_cache()
+                
+                db_manager.delete_pending_batch(batch_id)
+                logger.info(f"Stored {len(rows)} guidelines from AI batch {batch_id}")
+                
+            except Exception as e:
+                logger.error(f"Error checking AI batch {batch_id}: {e}")
+    finally:
+        # The AI client is tied to this run's event loop
+        await ai_summarizer.aclose()
+
+def run_scrape_and_update(use_batch_api=False):
+    """Synchronous entry point for the scheduler"""
+    asyncio.run(scrape_and_update(use_batch_api))
+
+def run_check_pending_batches():
+    """Synchronous entry point for the scheduler"""
+    asyncio.run(check_pending_batches())
 
 def start_background_scraping():
     """Start the background scraping scheduler"""
-    # Schedule scraping every 24 hours
-    schedule.every(24).hours.do(scrape_and_update)
+    # A single worker runs the jobs one at a time, sleeping until the next one is due.
+    # A job queued behind a slow one must still run late (once) rather than be
+    # dropped as missed until its next interval
+    scheduler = BackgroundScheduler(
+        executors={'default': {'type': 'threadpool', 'max_workers': 1}},
+        job_defaults={'misfire_grace_time': None, 'coalesce': True}
+    )
     
-    # Also run initial scraping
-    scrape_and_update()
+    # Schedule scraping every 24 hours; the daily run doesn't need real-time
+    # responses, so it goes through the cheaper Batch API
+    scheduler.add_job(run_scrape_and_update, 'interval', hours=24, kwargs={'use_batch_api': True})
+    scheduler.add_job(run_check_pending_batches, 'interval', minutes=30)
     
-    def run_scheduler():
-        while True:
-            schedule.run_pending()
-            time.sleep(3600)  # Check every hour
+    # Also run initial scraping
+    run_scrape_and_update()
     
-    # Start scheduler in background thread
-    scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-    scheduler_thread.start()
+    scheduler.start()
     logger.info("Background scraping scheduler started")
 
 # API Endpoints
@@ -219,77 +605,46 @@ def get_guidelines():
     specialty = request.args.get('specialty')
     year = request.args.get('year')
     
-    if source or specialty or year:
-        guidelines = db_manager.get_guidelines_by_filter(source, specialty, year)
-    else:
-        guidelines = db_manager.get_all_guidelines()
+    def generate():
+        # Stream rows straight from the cursor instead of building the whole list first
+        count = 0
+        yield b'{"guidelines":['
+        for guideline in db_manager.iter_guidelines(source, specialty, year):
+            yield (b',' if count else b'') + orjson.dumps(guideline)
+            count += 1
+        yield b'],"count":' + orjson.dumps(count)
+        yield b',"last_updated":' + orjson.dumps(datetime.datetime.now().isoformat()) + b'}'
     
-    return jsonify({
-        'guidelines': guidelines,
-        'count': len(guidelines),
-        'last_updated': datetime.datetime.now().isoformat()
-    })
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+@cached(_aggregate_cache, key=lambda: hashkey('sources'), lock=_aggregate_cache_lock)
+def _list_sources():
+    return db_manager.get_sources()
+
+@cached(_aggregate_cache, key=lambda: hashkey('specialties'), lock=_aggregate_cache_lock)
+def _list_specialties():
+    return db_manager.get_specialties()
+
+@cached(_aggregate_cache, key=lambda: hashkey('stats'), lock=_aggregate_cache_lock)
+def _compute_stats():
+    stats = db_manager.get_stats()
+    stats['last_updated'] = datetime.datetime.now().isoformat()
+    return stats
 
 @app.route('/api/sources', methods=['GET'])
 def get_sources():
     """Get list of available sources"""
-    conn = sqlite3.connect(db_manager.db_path)
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT DISTINCT source FROM guidelines ORDER BY source')
-    sources = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    
-    return jsonify({'sources': sources})
+    return jsonify({'sources': _list_sources()})
 
 @app.route('/api/specialties', methods=['GET'])
 def get_specialties():
     """Get list of available specialties from tags"""
-    conn = sqlite3.connect(db_manager.db_path)
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT tags FROM guidelines WHERE tags IS NOT NULL')
-    all_tags = []
-    for row in cursor.fetchall():
-        if row[0]:
-            tags = json.loads(row[0])
-            all_tags.extend(tags)
-    
-    # Get unique specialties
-    specialties = list(set(all_tags))
-    conn.close()
-    
-    return jsonify({'specialties': specialties})
+    return jsonify({'specialties': _list_specialties()})
 
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get statistics about the guidelines database"""
-    conn = sqlite3.connect(db_manager.db_path)
-    cursor = conn.cursor()
-    
-    # Total guidelines
-    cursor.execute('SELECT COUNT(*) FROM guidelines')
-    total_guidelines = cursor.fetchone()[0]
-    
-    # Guidelines by source
-    cursor.execute('SELECT source, COUNT(*) FROM guidelines GROUP BY source')
-    source_counts = dict(cursor.fetchall())
-    
-    # Recent guidelines (last 30 days)
-    cursor.execute('''
-        SELECT COUNT(*) FROM guidelines 
-        WHERE date(created_at) >= date('now', '-30 days')
-    ''')
-    recent_guidelines = cursor.fetchone()[0]
-    
-    conn.close()
-    
-    return jsonify({
-        'total_guidelines': total_guidelines,
-        'source_counts': source_counts,
-        'recent_guidelines': recent_guidelines,
-        'last_updated': datetime.datetime.now().isoformat()
-    })
+    return jsonify(_compute_stats())
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -1,97 +1,347 @@
-import requests
-from bs4 import BeautifulSoup
+import httpx
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
+import asyncio
 import re
+import itertools
+from urllib.parse import urldefrag, urljoin
 import logging
 from datetime import datetime, timedelta
 import json
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    # Fall back to lxml when selectolax isn't installed
+    LexborHTMLParser = None
+    import lxml.html
+    from lxml import etree
+
 logger = logging.getLogger(__name__)
 
+# Elements whose class mentions a date, looked up around each guideline link
+# in its nearest DATE_SEARCH_DEPTH ancestors
+DATE_SELECTOR = '[class*="date"], [class*="published"]'
+DATE_SEARCH_DEPTH = 4
+# The same elements for the lxml fallback, evaluated from an ancestor of the link
+DATE_XPATH = './/*[contains(@class, "date") or contains(@class, "published")]'
+
+# XPath expressions for the lxml fallback, compiled once at import
+if LexborHTMLParser is None:
+    _LINK_XPATH = etree.XPath('.//a[contains(@href, $fragment)]')
+    _DATE_XPATH = etree.XPath(DATE_XPATH)
+    _SCRIPT_STYLE_XPATH = etree.XPath('//script | //style')
+    # lxml rejects str input carrying an <?xml ... encoding=...?> declaration,
+    # so pages are always handed to it as UTF-8 bytes
+    _UTF8_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+# Connection pool of the shared async client; HTTP/2 multiplexes requests
+# to the same host over one connection
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# Runs of whitespace, collapsed to a single space in extracted page text
+_WS_RE = re.compile(r'\s+')
+
+# Charset a page declares for itself, looked for in its first CHARSET_SNIFF_BYTES
+# bytes when the Content-Type header doesn't give one
+CHARSET_SNIFF_BYTES = 1024
+_DECLARED_CHARSET_RE = re.compile(
+    rb'''(?:<meta\s[^>]*?charset|<\?xml\s[^>]*?encoding)\s*=\s*["']?\s*([\w.:-]+)''',
+    re.IGNORECASE
+)
+
+# Only the start of a guideline page is kept, so stop downloading after this many bytes
+MAX_CONTENT_BYTES = 256 * 1024
+
+# Responses worth retrying, with exponential backoff between attempts
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+
+class _AsyncRetryTransport(httpx.AsyncHTTPTransport):
+    """Async HTTP transport that also retries throttled and failed responses"""
+    
+    async def handle_async_request(self, request):
+        for attempt in range(MAX_RETRIES):
+            response = await super().handle_async_request(request)
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            await response.aclose()
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+        return await super().handle_async_request(request)
+
+def _link_target(href):
+    """The page a link points at, ignoring any #fragment"""
+    return urldefrag(href or '').url
+
+def _find_date_node(node, href_fragment):
+    """
+    Return the first date-like element inside the link's nearest ancestors, or None
+    
+    The search stops at the first ancestor that also holds a link to another
+    guideline, as that ancestor is the list of guidelines rather than this
+    link's own entry.
+    """
+    target = _link_target(node.attributes.get('href'))
+    link_selector = f'a[href*="{href_fragment}"]'
+    for _ in range(DATE_SEARCH_DEPTH):
+        node = node.parent
+        if node is None:
+            break
+        if any(_link_target(link.attributes.get('href')) != target for link in node.css(link_selector)):
+            break
+        # Lexbor's css() also matches the node itself, which isn't inside it;
+        # compare by mem_id since == serializes both subtrees
+        date_node = next((candidate for candidate in node.css(DATE_SELECTOR) if candidate.mem_id != node.mem_id), None)
+        if date_node is not None:
+            return date_node
+    return None
+
+def _find_date_element(element, href_fragment):
+    """lxml counterpart of _find_date_node"""
+    target = _link_target(element.get('href'))
+    for ancestor in itertools.islice(element.iterancestors(), DATE_SEARCH_DEPTH):
+        if any(_link_target(link.get('href')) != target for link in _LINK_XPATH(ancestor, fragment=href_fragment)):
+            break
+        date_elements = _DATE_XPATH(ancestor)
+        if date_elements:
+            return date_elements[0]
+    return None
+
+def _unique_links(nodes, get_href, get_title, base_url, limit, accept=None):
+    """
+    Yield (node, title, href) for the first limit accepted links with distinct targets
+    
+    Hrefs are resolved against base_url, and links pointing at an already
+    seen page (ignoring any #fragment) are skipped. Links whose title fails
+    accept are skipped without marking their target as seen, so an untitled
+    link (e.g. a thumbnail) doesn't hide a titled link to the same page.
+    """
+    seen = set()
+    for node in nodes:
+        if limit is not None and len(seen) >= limit:
+            break
+        
+        href = get_href(node)
+        if base_url:
+            href = urljoin(base_url, href)
+        
+        target = urldefrag(href).url
+        if target in seen:
+            continue
+        
+        title = get_title(node)
+        if accept is not None and not accept(title):
+            continue
+        seen.add(target)
+        
+        yield node, title, href
+
+def _lxml_document(html):
+    """Parse an HTML document (str or UTF-8 bytes) with lxml"""
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+    # Always parse as a whole document: fromstring() guesses from the start of
+    # the markup and returns a lone element when it doesn't begin with <html>
+    return lxml.html.document_fromstring(html, parser=_UTF8_HTML_PARSER)
+
+def _find_links(html, href_fragment, base_url=None, limit=None, accept=None):
+    """
+    Find the distinct links whose href contains href_fragment
+    
+    Returns a list of (title, href, date) tuples for at most limit links whose
+    title passes accept (if given), where
+    href is resolved against base_url and date is the text of the first
+    date-like element in the nearest of the link's ancestors that has one, or
+    None if there is none before reaching an ancestor shared with another
+    guideline link. Links past the limit are never inspected.
+    """
+    links = []
+    
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        nodes = tree.css(f'a[href*="{href_fragment}"]')
+        for node, title, href in _unique_links(
+            nodes,
+            lambda node: node.attributes.get('href'),
+            lambda node: node.text(strip=True),
+            base_url, limit, accept
+        ):
+            date_node = _find_date_node(node, href_fragment)
+            
+            links.append((
+                title,
+                href,
+                date_node.text(strip=True) if date_node is not None else None
+            ))
+    else:
+        tree = _lxml_document(html)
+        nodes = _LINK_XPATH(tree, fragment=href_fragment)
+        for node, title, href in _unique_links(
+            nodes,
+            lambda node: node.get('href'),
+            lambda node: ''.join(text.strip() for text in node.itertext()),
+            base_url, limit, accept
+        ):
+            date_element = _find_date_element(node, href_fragment)
+            
+            links.append((
+                title,
+                href,
+                ''.join(text.strip() for text in date_element.itertext()) if date_element is not None else None
+            ))
+    
+    return links
+
+def _decode_body(body, response):
+    """
+    Decode a response body with the charset given in its headers
+    
+    Without one, the charset declared by the page itself (<meta charset>,
+    <meta http-equiv="Content-Type"> or <?xml encoding?>) in its first
+    CHARSET_SNIFF_BYTES bytes is used, and UTF-8 without either. With the lxml
+    fallback the decoded text is handed back as UTF-8 bytes (see _lxml_document).
+    """
+    encoding = response.charset_encoding
+    if not encoding:
+        match = _DECLARED_CHARSET_RE.search(body, 0, CHARSET_SNIFF_BYTES)
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    
+    try:
+        text = body.decode(encoding, errors='replace')
+    except LookupError:
+        text = body.decode('utf-8', errors='replace')
+    
+    if LexborHTMLParser is None:
+        return text.encode('utf-8')
+    return text
+
+def _extract_text(html):
+    """
+    Return the visible text of an HTML document, without scripts and styles
+    
+    Text from separate elements is joined with spaces so words don't run together
+    """
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        tree.strip_tags(['script', 'style'])
+        return tree.root.text(separator=' ') if tree.root is not None else ''
+    
+    tree = _lxml_document(html)
+    for element in _SCRIPT_STYLE_XPATH(tree):
+        element.drop_tree()
+    return ' '.join(tree.itertext())
+
 class MedicalGuidelineScraper:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.http_options = {
+            'headers': {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                'Accept-Encoding': 'gzip, deflate, br'
+            },
+            'timeout': 30.0,
+            'follow_redirects': True
+        }
+        
+        # Pooled HTTP/2 client, created on first use in an event loop
+        self.aclient = None
+        self._aclient_loop = None
+        
+        # url -> (etag, last_modified, guidelines) for conditional requests
+        self._page_cache = {}
+        
+        # Selenium WebDriver shared by the selenium sources, see selenium_driver
+        self._driver = None
         
         # Configure Chrome options for headless scraping
         self.chrome_options = Options()
-        self.chrome_options.add_argument('--headless')
+        self.chrome_options.add_argument('--headless=new')
         self.chrome_options.add_argument('--no-sandbox')
         self.chrome_options.add_argument('--disable-dev-shm-usage')
         self.chrome_options.add_argument('--disable-gpu')
         self.chrome_options.add_argument('--window-size=1920,1080')
         
-        # Define source configurations
+        # Only the links are needed, so skip images and stylesheets and
+        # return from driver.get once the DOM is ready
+        self.chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        self.chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.managed_default_content_settings.stylesheets': 2
+        })
+        self.chrome_options.page_load_strategy = 'eager'
+        
+        # Define source configurations. 'selenium' sources render their
+        # links with JavaScript (though the plain HTML is tried first) and
+        # href_fragment picks out the guideline links on each page
         self.sources = {
             'WHO': {
                 'url': 'https://www.who.int/publications/guidelines',
                 'type': 'selenium',
-                'selectors': {
-                    'guideline_links': 'a[href*="/publications/"]',
-                    'title': 'h1, h2, h3',
-                    'date': '.date, .published-date',
-                    'content': '.content, .description'
-                }
+                'href_fragment': '/publications/'
             },
             'CDC': {
                 'url': 'https://www.cdc.gov/mmwr/index.html',
                 'type': 'requests',
-                'selectors': {
-                    'guideline_links': 'a[href*="/mmwr/"]',
-                    'title': 'h1, h2, h3',
-                    'date': '.date, .published-date',
-                    'content': '.content, .description'
-                }
+                'href_fragment': '/mmwr/'
             },
             'NICE': {
                 'url': 'https://www.nice.org.uk/guidance/published',
                 'type': 'selenium',
-                'selectors': {
-                    'guideline_links': 'a[href*="/guidance/"]',
-                    'title': 'h1, h2, h3',
-                    'date': '.date, .published-date',
-                    'content': '.content, .description'
-                }
+                'href_fragment': '/guidance/'
             },
             'AHA': {
                 'url': 'https://www.heart.org/en/professional/quality-improvement/clinical-guidance',
                 'type': 'selenium',
-                'selectors': {
-                    'guideline_links': 'a[href*="/professional/"]',
-                    'title': 'h1, h2, h3',
-                    'date': '.date, .published-date',
-                    'content': '.content, .description'
-                }
+                'href_fragment': '/professional/'
             },
             'ADA': {
                 'url': 'https://diabetesjournals.org/care/issue',
                 'type': 'requests',
-                'selectors': {
-                    'guideline_links': 'a[href*="/care/"]',
-                    'title': 'h1, h2, h3',
-                    'date': '.date, .published-date',
-                    'content': '.content, .description'
-                }
+                'href_fragment': '/care/'
             },
             'IDSA': {
                 'url': 'https://www.idsociety.org/practice-guideline/',
                 'type': 'selenium',
-                'selectors': {
-                    'guideline_links': 'a[href*="/practice-guideline/"]',
-                    'title': 'h1, h2, h3',
-                    'date': '.date, .published-date',
-                    'content': '.content, .description'
-                }
+                'href_fragment': '/practice-guideline/'
             }
         }
     
+    def _async_client(self):
+        """Return the pooled async client, creating it for the running event loop if needed"""
+        loop = asyncio.get_running_loop()
+        # A client can't be reused across event loops (each asyncio.run() gets a new one)
+        if self.aclient is None or self._aclient_loop is not loop:
+            transport = _AsyncRetryTransport(http2=True, limits=HTTP_LIMITS, retries=MAX_RETRIES)
+            self.aclient = httpx.AsyncClient(transport=transport, **self.http_options)
+            self._aclient_loop = loop
+        return self.aclient
+    
+    async def aclose(self):
+        """Close the pooled HTTP connections"""
+        if self.aclient is not None:
+            await self.aclient.aclose()
+            self.aclient = None
+            self._aclient_loop = None
+    
+    @property
+    def selenium_driver(self):
+        """The shared Selenium WebDriver, started on first use (None if it can't be started)"""
+        if not self._driver:
+            self._driver = self.get_selenium_driver()
+        return self._driver
+    
+    def close_selenium_driver(self):
+        """Quit the shared Selenium WebDriver, if it was started"""
+        if self._driver:
+            try:
+                self._driver.quit()
+            except Exception as e:
+                logger.error(f"Error closing Selenium driver: {e}")
+            self._driver = None
+    
     def get_selenium_driver(self):
         """Get a configured Selenium WebDriver"""
         try:
@@ -102,356 +352,263 @@ class MedicalGuidelineScraper:
             logger.error(f"Failed to initialize Selenium driver: {e}")
             return None
     
-    def scrape_who_guidelines(self):
-        """Scrape WHO guidelines"""
+    def _parse_guidelines(self, source_name, html):
+        """Build guideline records from the links to a source's guidelines in a page"""
         guidelines = []
-        try:
-            driver = self.get_selenium_driver()
-            if not driver:
-                return guidelines
-            
-            driver.get(self.sources['WHO']['url'])
-            time.sleep(5)
-            
-            # Wait for content to load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            
-            # Find guideline links
-            links = soup.find_all('a', href=re.compile(r'/publications/'))
-            
-            for link in links[:10]:  # Limit to 10 most recent
-                try:
-                    title = link.get_text(strip=True)
-                    if not title or len(title) < 10:
-                        continue
-                    
-                    href = link.get('href')
-                    if href.startswith('/'):
-                        href = f"https://www.who.int{href}"
-                    
-                    # Try to extract date from parent elements
-                    date_element = link.find_parent().find(class_=re.compile(r'date|published'))
-                    date = date_element.get_text(strip=True) if date_element else datetime.now().strftime('%Y-%m-%d')
-                    
-                    guidelines.append({
-                        'title': title,
-                        'source': 'WHO',
-                        'link': href,
-                        'date': date,
-                        'content': title  # Use title as content for now
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"Error processing WHO guideline: {e}")
-                    continue
-            
-            driver.quit()
-            
-        except Exception as e:
-            logger.error(f"Error scraping WHO guidelines: {e}")
+        
+        # Limit to 10 most recent, resolving relative links against the source page
+        # and skipping links without a meaningful title (e.g. thumbnails)
+        source = self.sources[source_name]
+        links = _find_links(
+            html, source['href_fragment'], source['url'], limit=10,
+            accept=lambda title: len(title) >= 10
+        )
+        
+        for title, href, date in links:
+            try:
+                # Default to today when no date was found next to the link
+                date = date or datetime.now().strftime('%Y-%m-%d')
+                
+                guidelines.append({
+                    'title': title,
+                    'source': source_name,
+                    'link': href,
+                    'date': date,
+                    'content': title  # Use title as content for now
+                })
+                
+            except Exception as e:
+                logger.error(f"Error processing {source_name} guideline: {e}")
+                continue
         
         return guidelines
     
-    def scrape_cdc_guidelines(self):
-        """Scrape CDC MMWR guidelines"""
-        guidelines = []
+    async def _fetch_guidelines(self, client, source_name):
+        """
+        Fetch a source's page over HTTP and parse its guidelines
+        
+        The validators from the previous fetch are sent along, so an unchanged
+        page comes back as 304 and its previously parsed guidelines are reused
+        """
+        url = self.sources[source_name]['url']
+        cached = self._page_cache.get(url)
+        
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        response = await client.get(url, headers=headers)
+        if response.status_code == 304 and cached:
+            logger.info(f"{source_name} page not modified, reusing its parsed guidelines")
+            return [dict(guideline) for guideline in cached[2]]
+        response.raise_for_status()
+        
+        guidelines = self._parse_guidelines(source_name, _decode_body(response.content, response))
+        
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            # Callers annotate the returned dicts, so keep copies of our own
+            self._page_cache[url] = (etag, last_modified, [dict(guideline) for guideline in guidelines])
+        
+        return guidelines
+    
+    async def _try_static(self, client, source_name):
+        """
+        Scrape a browser-based source from its plain HTML
+        
+        Returns the guidelines found, or an empty list when the page needs
+        JavaScript to render its links (or couldn't be fetched)
+        """
         try:
-            response = self.session.get(self.sources['CDC']['url'], timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find MMWR articles
-            links = soup.find_all('a', href=re.compile(r'/mmwr/'))
-            
-            for link in links[:10]:  # Limit to 10 most recent
-                try:
-                    title = link.get_text(strip=True)
-                    if not title or len(title) < 10:
-                        continue
-                    
-                    href = link.get('href')
-                    if href.startswith('/'):
-                        href = f"https://www.cdc.gov{href}"
-                    
-                    # Try to extract date
-                    date_element = link.find_parent().find(class_=re.compile(r'date|published'))
-                    date = date_element.get_text(strip=True) if date_element else datetime.now().strftime('%Y-%m-%d')
-                    
-                    guidelines.append({
-                        'title': title,
-                        'source': 'CDC',
-                        'link': href,
-                        'date': date,
-                        'content': title
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"Error processing CDC guideline: {e}")
-                    continue
-                    
-        except Exception as e:
-            logger.error(f"Error scraping CDC guidelines: {e}")
+            guidelines = await self._fetch_guidelines(client, source_name)
+        except httpx.HTTPError as e:
+            logger.info(f"Static fetch of {source_name} failed, falling back to Selenium: {e}")
+            return []
         
+        if guidelines:
+            logger.info(f"Found {len(guidelines)} guidelines from {source_name} without a browser")
         return guidelines
     
-    def scrape_nice_guidelines(self):
-        """Scrape NICE guidelines"""
+    async def _scrape_page(self, client, source_name):
+        """Scrape a source whose guideline links are in its plain HTML"""
         guidelines = []
         try:
-            driver = self.get_selenium_driver()
-            if not driver:
-                return guidelines
-            
-            driver.get(self.sources['NICE']['url'])
-            time.sleep(5)
-            
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            
-            # Find guideline links
-            links = soup.find_all('a', href=re.compile(r'/guidance/'))
-            
-            for link in links[:10]:
-                try:
-                    title = link.get_text(strip=True)
-                    if not title or len(title) < 10:
-                        continue
-                    
-                    href = link.get('href')
-                    if href.startswith('/'):
-                        href = f"https://www.nice.org.uk{href}"
-                    
-                    date_element = link.find_parent().find(class_=re.compile(r'date|published'))
-                    date = date_element.get_text(strip=True) if date_element else datetime.now().strftime('%Y-%m-%d')
-                    
-                    guidelines.append({
-                        'title': title,
-                        'source': 'NICE',
-                        'link': href,
-                        'date': date,
-                        'content': title
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"Error processing NICE guideline: {e}")
-                    continue
-            
-            driver.quit()
-            
+            guidelines = await self._fetch_guidelines(client, source_name)
         except Exception as e:
-            logger.error(f"Error scraping NICE guidelines: {e}")
+            logger.error(f"Error scraping {source_name} guidelines: {e}")
         
         return guidelines
     
-    def scrape_aha_guidelines(self):
-        """Scrape American Heart Association guidelines"""
+    def _scrape_rendered_page(self, driver, source_name):
+        """Scrape a source whose guideline links are rendered by JavaScript"""
         guidelines = []
+        source = self.sources[source_name]
         try:
-            driver = self.get_selenium_driver()
-            if not driver:
-                return guidelines
+            driver.get(source['url'])
             
-            driver.get(self.sources['AHA']['url'])
-            time.sleep(5)
-            
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            # Wait for the guideline links to render
+            link_selector = f'a[href*="{source["href_fragment"]}"]'
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, link_selector))
             )
             
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            
-            # Find guideline links
-            links = soup.find_all('a', href=re.compile(r'/professional/'))
-            
-            for link in links[:10]:
-                try:
-                    title = link.get_text(strip=True)
-                    if not title or len(title) < 10:
-                        continue
-                    
-                    href = link.get('href')
-                    if href.startswith('/'):
-                        href = f"https://www.heart.org{href}"
-                    
-                    date_element = link.find_parent().find(class_=re.compile(r'date|published'))
-                    date = date_element.get_text(strip=True) if date_element else datetime.now().strftime('%Y-%m-%d')
-                    
-                    guidelines.append({
-                        'title': title,
-                        'source': 'AHA',
-                        'link': href,
-                        'date': date,
-                        'content': title
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"Error processing AHA guideline: {e}")
-                    continue
-            
-            driver.quit()
+            guidelines = self._parse_guidelines(source_name, driver.page_source)
             
         except Exception as e:
-            logger.error(f"Error scraping AHA guidelines: {e}")
+            logger.error(f"Error scraping {source_name} guidelines: {e}")
         
         return guidelines
     
-    def scrape_ada_guidelines(self):
-        """Scrape American Diabetes Association guidelines"""
-        guidelines = []
+    def _run_scraper(self, source_name, scrape_function, *args):
+        """Run a single source scraper, logging and swallowing any error"""
         try:
-            response = self.session.get(self.sources['ADA']['url'], timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find ADA Care articles
-            links = soup.find_all('a', href=re.compile(r'/care/'))
-            
-            for link in links[:10]:
-                try:
-                    title = link.get_text(strip=True)
-                    if not title or len(title) < 10:
-                        continue
-                    
-                    href = link.get('href')
-                    if href.startswith('/'):
-                        href = f"https://diabetesjournals.org{href}"
-                    
-                    date_element = link.find_parent().find(class_=re.compile(r'date|published'))
-                    date = date_element.get_text(strip=True) if date_element else datetime.now().strftime('%Y-%m-%d')
-                    
-                    guidelines.append({
-                        'title': title,
-                        'source': 'ADA',
-                        'link': href,
-                        'date': date,
-                        'content': title
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"Error processing ADA guideline: {e}")
-                    continue
-                    
+            logger.info(f"Scraping {source_name} guidelines...")
+            guidelines = scrape_function(*args)
+            logger.info(f"Found {len(guidelines)} guidelines from {source_name}")
+            return guidelines
         except Exception as e:
-            logger.error(f"Error scraping ADA guidelines: {e}")
-        
-        return guidelines
+            logger.error(f"Error scraping {source_name}: {e}")
+            return []
     
-    def scrape_idsa_guidelines(self):
-        """Scrape IDSA practice guidelines"""
-        guidelines = []
+    async def _run_async_scraper(self, source_name, scrape_function, *args):
+        """Await a single async source scraper, logging and swallowing any error"""
         try:
-            driver = self.get_selenium_driver()
-            if not driver:
-                return guidelines
-            
-            driver.get(self.sources['IDSA']['url'])
-            time.sleep(5)
-            
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            
-            # Find guideline links
-            links = soup.find_all('a', href=re.compile(r'/practice-guideline/'))
-            
-            for link in links[:10]:
-                try:
-                    title = link.get_text(strip=True)
-                    if not title or len(title) < 10:
-                        continue
-                    
-                    href = link.get('href')
-                    if href.startswith('/'):
-                        href = f"https://www.idsociety.org{href}"
-                    
-                    date_element = link.find_parent().find(class_=re.compile(r'date|published'))
-                    date = date_element.get_text(strip=True) if date_element else datetime.now().strftime('%Y-%m-%d')
-                    
-                    guidelines.append({
-                        'title': title,
-                        'source': 'IDSA',
-                        'link': href,
-                        'date': date,
-                        'content': title
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"Error processing IDSA guideline: {e}")
-                    continue
-            
-            driver.quit()
-            
+            logger.info(f"Scraping {source_name} guidelines...")
+            guidelines = await scrape_function(*args)
+            logger.info(f"Found {len(guidelines)} guidelines from {source_name}")
+            return guidelines
         except Exception as e:
-            logger.error(f"Error scraping IDSA guidelines: {e}")
-        
-        return guidelines
+            logger.error(f"Error scraping {source_name}: {e}")
+            return []
     
-    def scrape_all_sources(self):
-        """Scrape guidelines from all sources"""
-        all_guidelines = []
+    def _scrape_selenium_sources(self, source_names):
+        """Scrape the selenium-based sources one after another in a single shared browser"""
+        results = {}
         
-        logger.info("Starting to scrape all medical guideline sources...")
+        driver = self.selenium_driver
+        if not driver:
+            return results
         
-        # Scrape each source
-        sources_to_scrape = [
-            ('WHO', self.scrape_who_guidelines),
-            ('CDC', self.scrape_cdc_guidelines),
-            ('NICE', self.scrape_nice_guidelines),
-            ('AHA', self.scrape_aha_guidelines),
-            ('ADA', self.scrape_ada_guidelines),
-            ('IDSA', self.scrape_idsa_guidelines)
-        ]
-        
-        for source_name, scrape_function in sources_to_scrape:
+        for source_name in source_names:
+            results[source_name] = self._run_scraper(source_name, self._scrape_rendered_page, driver, source_name)
             try:
-                logger.info(f"Scraping {source_name} guidelines...")
-                guidelines = scrape_function()
-                all_guidelines.extend(guidelines)
-                logger.info(f"Found {len(guidelines)} guidelines from {source_name}")
-                
-                # Add small delay between sources to be respectful
-                time.sleep(2)
-                
+                # Don't leak cookies/session state between sites
+                driver.delete_all_cookies()
             except Exception as e:
-                logger.error(f"Error scraping {source_name}: {e}")
-                continue
+                logger.error(f"Error clearing browser cookies: {e}")
+        
+        return results
+    
+    async def _scrape_browser_sources(self, client, source_names):
+        """
+        Scrape the selenium-based sources, only starting a browser for the
+        ones whose links aren't present in the plain HTML
+        """
+        static_results = await asyncio.gather(*(
+            self._try_static(client, source_name) for source_name in source_names
+        ))
+        results = {
+            source_name: guidelines
+            for source_name, guidelines in zip(source_names, static_results)
+            if guidelines
+        }
+        
+        remaining = [source_name for source_name in source_names if source_name not in results]
+        if remaining:
+            loop = asyncio.get_running_loop()
+            results.update(await loop.run_in_executor(None, self._scrape_selenium_sources, remaining))
+        
+        return results
+    
+    async def scrape_all_sources_async(self):
+        """Scrape guidelines from all sources concurrently"""
+        logger.info("Starting to scrape all medical guideline sources...")
+        
+        selenium_sources = [name for name, source in self.sources.items() if source['type'] == 'selenium']
+        http_sources = [name for name, source in self.sources.items() if source['type'] == 'requests']
+        
+        # The HTTP sources are fetched on the event loop while the selenium
+        # sources, which share one browser that is not thread-safe, run
+        # sequentially in a worker thread once the plain HTML attempts are done
+        client = self._async_client()
+        try:
+            selenium_results, *http_results = await asyncio.gather(
+                self._scrape_browser_sources(client, selenium_sources),
+                *(
+                    self._run_async_scraper(source_name, self._scrape_page, client, source_name)
+                    for source_name in http_sources
+                ),
+                return_exceptions=True
+            )
+        finally:
+            # All JS sources are done, so don't keep a browser around until the next scrape
+            await asyncio.get_running_loop().run_in_executor(None, self.close_selenium_driver)
+        
+        results = {}
+        if isinstance(selenium_results, Exception):
+            logger.error(f"Error scraping selenium sources: {selenium_results}")
+        else:
+            results.update(selenium_results)
+        for source_name, guidelines in zip(http_sources, http_results):
+            results[source_name] = guidelines
+        
+        # Keep the configured source order regardless of completion order
+        all_guidelines = []
+        for source_name in self.sources:
+            all_guidelines.extend(results.get(source_name, []))
         
         logger.info(f"Total guidelines scraped: {len(all_guidelines)}")
         return all_guidelines
     
-    def get_guideline_content(self, url):
+    def scrape_all_sources(self):
+        """Scrape guidelines from all sources, for callers outside an event loop"""
+        async def scrape():
+            try:
+                return await self.scrape_all_sources_async()
+            finally:
+                await self.aclose()
+        
+        return asyncio.run(scrape())
+    
+    async def get_guideline_content(self, url):
         """Get detailed content from a guideline URL"""
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+            body = bytearray()
+            async with self._async_client().stream('GET', url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= MAX_CONTENT_BYTES:
+                        break
             
-            # Get text content
-            text = soup.get_text()
+            # Get text content, without script and style elements
+            text = _extract_text(_decode_body(bytes(body[:MAX_CONTENT_BYTES]), response))
             
             # Clean up whitespace
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+            text = _WS_RE.sub(' ', text).strip()
             
             return text[:2000]  # Limit content length
             
         except Exception as e:
             logger.error(f"Error getting content from {url}: {e}")
-            return "" 
\ No newline at end of file
+            return ""
+    
+    async def get_many_contents(self, urls, concurrency=10):
+        """
+        Get the content of many guideline URLs concurrently
+        
+        Returns a dict mapping each URL to its content, which is empty if the
+        page couldn't be fetched
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch(url):
+            async with semaphore:
+                return url, await self.get_guideline_content(url)
+        
+        return dict(await asyncio.gather(*(fetch(url) for url in dict.fromkeys(urls)))) 
\ No newline at end of file
@@ -9,7 +9,6 @@ import sys
 import subprocess
 import time
 import signal
-import threading
 from pathlib import Path
 
 def check_dependencies():
@@ -20,9 +19,14 @@ def check_dependencies():
     try:
         import flask
         import requests
-        import beautifulsoup4
+        import selectolax
         import selenium
         import openai
+        # WSGI server the backend runs under, see start_backend
+        if os.name == 'nt':
+            import waitress
+        else:
+            import gunicorn
         print("✅ Python dependencies OK")
     except ImportError as e:
         print(f"❌ Missing Python dependency: {e}")
@@ -102,21 +106,28 @@ def install_frontend_dependencies():
     return True
 
 def start_backend():
-    """Start the Flask backend server"""
+    """Start the Flask backend under a WSGI server in a separate process"""
     print("🚀 Starting backend server...")
     
-    # Set environment variables
-    os.environ['FLASK_ENV'] = 'development'
-    os.environ['FLASK_DEBUG'] = 'True'
+    # gunicorn doesn't run on Windows, so use waitress there
+    if os.name == 'nt':
+        command = [sys.executable, '-m', 'waitress', '--host=0.0.0.0', '--port=5000', '--threads=8', 'app:app']
+    else:
+        command = [
+            sys.executable, '-m', 'gunicorn',
+            '-w', str(os.cpu_count() or 1),
+            '-k', 'gthread', '--threads', '4',
+            '-b', '0.0.0.0:5000',
+            'app:app'
+        ]
     
     try:
-        # Import and run Flask app
-        from app import app
-        print("✅ Backend server started at http://localhost:5000")
-        app.run(host='0.0.0.0', port=5000, debug=True)
+        process = subprocess.Popen(command)
+        print("✅ Backend server launched at http://localhost:5000")
+        return process
     except Exception as e:
         print(f"❌ Failed to start backend: {e}")
-        return False
+        return None
 
 def start_frontend():
     """Start the React frontend development server"""
@@ -153,16 +164,26 @@ def main():
     
     print("\n🎯 Starting services...")
     
-    # Start backend in a separate thread
-    backend_thread = threading.Thread(target=start_backend, daemon=True)
-    backend_thread.start()
-    
-    # Wait a moment for backend to start
-    time.sleep(3)
+    # Start backend in a separate process
+    backend = start_backend()
+    if not backend:
+        print("❌ Backend failed to start")
+        sys.exit(1)
     
-    # Start frontend
-    print("✅ Backend ready, starting frontend...")
-    start_frontend()
+    try:
+        # Wait a moment for backend to start
+        time.sleep(3)
+        
+        # Popen succeeds even if the server exits right away (e.g. it fails to import the app)
+        if backend.poll() is not None:
+            print(f"❌ Backend exited with code {backend.returncode}")
+            sys.exit(1)
+        
+        # Start frontend
+        print("✅ Backend ready, starting frontend...")
+        start_frontend()
+    finally:
+        backend.terminate()
 
 if __name__ == "__main__":
     try:
@@ -8,14 +8,18 @@ import requests
 import json
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Shared by all tests so connections to the servers are kept alive
+session = requests.Session()
+
 def test_backend_health():
     """Test if the backend is running and healthy"""
     print("🔍 Testing backend health...")
     
     try:
-        response = requests.get('http://localhost:5000/api/health', timeout=10)
+        response = session.get('http://localhost:5000/api/health', timeout=10)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Backend healthy: {data}")
@@ -38,19 +42,23 @@ def test_api_endpoints():
         ('/api/stats', 'GET')
     ]
     
-    all_passed = True
-    
-    for endpoint, method in endpoints:
+    def check(endpoint, method):
         try:
-            response = requests.request(method, f'http://localhost:5000{endpoint}', timeout=10)
+            response = session.request(method, f'http://localhost:5000{endpoint}', timeout=10)
             if response.status_code == 200:
-                print(f"✅ {method} {endpoint} - OK")
-            else:
-                print(f"❌ {method} {endpoint} - {response.status_code}")
-                all_passed = False
+                return True, f"✅ {method} {endpoint} - OK"
+            return False, f"❌ {method} {endpoint} - {response.status_code}"
         except requests.exceptions.RequestException as e:
-            print(f"❌ {method} {endpoint} - Error: {e}")
-            all_passed = False
+            return False, f"❌ {method} {endpoint} - Error: {e}"
+    
+    # Hit all endpoints at once, then report in the listed order
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+        results = list(executor.map(lambda args: check(*args), endpoints))
+    
+    all_passed = True
+    for passed, message in results:
+        print(message)
+        all_passed = all_passed and passed
     
     return all_passed
 
@@ -60,7 +68,7 @@ def test_database():
     
     try:
         # Test getting guidelines
-        response = requests.get('http://localhost:5000/api/guidelines', timeout=10)
+        response = session.get('http://localhost:5000/api/guidelines', timeout=10)
         if response.status_code == 200:
             data = response.json()
             guideline_count = len(data.get('guidelines', []))
@@ -79,7 +87,7 @@ def test_scraping():
     
     try:
         # Check if we have guidelines from different sources
-        response = requests.get('http://localhost:5000/api/sources', timeout=10)
+        response = session.get('http://localhost:5000/api/sources', timeout=10)
         if response.status_code == 200:
             data = response.json()
             sources = data.get('sources', [])
@@ -102,7 +110,7 @@ def test_frontend():
     print("\n🔍 Testing frontend...")
     
     try:
-        response = requests.get('http://localhost:3000', timeout=10)
+        response = session.get('http://localhost:3000', timeout=10)
         if response.status_code == 200:
             print("✅ Frontend accessible")
             return True
@@ -120,7 +128,7 @@ def test_ai_functionality():
     
     try:
         # Get some guidelines to test AI processing
-        response = requests.get('http://localhost:5000/api/guidelines?limit=1', timeout=10)
+        response = session.get('http://localhost:5000/api/guidelines?limit=1', timeout=10)
         if response.status_code == 200:
             data = response.json()
             guidelines = data.get('guidelines', [])